@@ -0,0 +1,260 @@
+"""
+Benchmark for the mobile app's polling pattern against the list endpoints.
+
+Runs the API in-process against a throwaway in-memory SQLite database and
+reports, per poll, the bytes sent and the CPU time spent for:
+
+  * identity  - no compression, no conditional request (old behaviour)
+  * gzip      - Accept-Encoding: gzip
+  * etag      - gzip plus If-None-Match with the last seen ETag (304 path)
+
+Before benchmarking it checks, through the real endpoints, that every crud
+write touching a list turns a 304 back into a 200 with a new ETag.
+
+Usage (from the repository root, needs requirements-dev.txt):
+
+    python -m backend.bench_polling [--polls 500] [--farmers 300] [--receipts 100]
+
+"wire bytes" is the status line, response headers and (possibly compressed)
+body as seen by the client; a real server adds a few more headers (Date,
+Server) to every response. "body bytes" is the body alone.
+
+"server CPU" is process time spent inside the ASGI app (GZipMiddleware
+included) while the test client thread waits on it. "total CPU" adds the
+test client's own overhead around each request.
+"""
+import argparse
+import time
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from . import crud, models, schemas, auth, database
+
+PASSWORD = "bench_password"
+
+
+class ServerCPUTimer:
+    """ASGI wrapper accumulating process time spent handling HTTP requests."""
+
+    def __init__(self, app):
+        self.app = app
+        self.seconds = 0.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.process_time()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.seconds += time.process_time() - start
+
+
+def seed_company(db, name: str, username: str) -> models.Company:
+    company = models.Company(name=name, address="Bench Road", phone_number="0000000000")
+    db.add(company)
+    db.flush()
+    db.add(models.User(
+        username=username,
+        email=f"{username}@example.com",
+        full_name=username,
+        hashed_password=auth.get_password_hash(PASSWORD),
+        role="agent",
+        company_id=company.id,
+    ))
+    return company
+
+
+def seed(num_farmers: int, num_receipts: int):
+    """Creates two companies with an agent each and the requested rows."""
+    db = database.SessionLocal()
+    try:
+        company = seed_company(db, "Bench Mill", "bench_agent")
+        other_company = seed_company(db, "Other Mill", "other_agent")
+        farmers = [
+            models.Farmer(
+                name=f"Farmer {i}",
+                village=f"Village {i % 25}",
+                mobile_number=f"9{i:09d}",
+                aadhaar_number=f"{i:012d}",
+                farm_area_acres=1.5 + (i % 10),
+                company_id=company.id,
+            )
+            for i in range(num_farmers)
+        ]
+        db.add_all(farmers)
+        db.flush()
+        farmer_id = farmers[0].id
+        db.add_all([
+            models.Receipt(
+                farmer_id=farmer_id,
+                date=date(2024, 1, 1 + i % 28),
+                seed_cost_debit=1200.0 + i,
+                rice_sale_credit=5400.0 + i,
+                final_balance=4200.0,
+            )
+            for i in range(num_receipts)
+        ])
+        db.commit()
+        return company.id, other_company.id, farmer_id
+    finally:
+        db.close()
+
+
+def login(client: TestClient, username: str) -> dict:
+    response = client.post("/token", data={"username": username, "password": PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _check(condition: bool, message: str):
+    if not condition:
+        raise RuntimeError(f"ETag check failed: {message}")
+
+
+def expect_unchanged(client: TestClient, url: str, headers: dict, etag: str):
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    _check(response.status_code == 304, f"{url} returned {response.status_code}, expected 304")
+    _check(response.content == b"", f"{url} 304 carried a body")
+    _check(response.headers.get("etag") == etag, f"{url} 304 changed the ETag")
+
+
+def expect_changed(client: TestClient, url: str, headers: dict, etag: str, after: str) -> str:
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    _check(response.status_code == 200, f"{url} returned {response.status_code} after {after}")
+    new_etag = response.headers.get("etag")
+    _check(new_etag and new_etag != etag, f"{url} kept its ETag after {after}")
+    expect_unchanged(client, url, headers, new_etag)
+    return new_etag
+
+
+def check_invalidation(client: TestClient, company_id: int, other_company_id: int, farmer_id: int):
+    """Polls, writes through crud / the API, and polls again for each write path."""
+    agent = login(client, "bench_agent")
+    other_agent = login(client, "other_agent")
+    farmers_url = "/farmers/"
+    receipts_url = f"/farmers/{farmer_id}/receipts/"
+
+    etag = client.get(farmers_url, headers=agent).headers["etag"]
+    other_etag = client.get(farmers_url, headers=other_agent).headers["etag"]
+    expect_unchanged(client, farmers_url, agent, etag)
+
+    response = client.post(farmers_url, headers=agent, json={
+        "name": "Check Farmer",
+        "village": "Check Village",
+        "mobile_number": "8000000001",
+        "aadhaar_number": "800000000001",
+        "farm_area_acres": 2.0,
+        "company_id": company_id,
+    })
+    _check(response.status_code == 201, f"create farmer returned {response.status_code}")
+    new_farmer_id = response.json()["id"]
+    etag = expect_changed(client, farmers_url, agent, etag, "create_farmer")
+
+    db = database.SessionLocal()
+    try:
+        crud.update_farmer(db, new_farmer_id, schemas.FarmerUpdate(name="Renamed Farmer"))
+        etag = expect_changed(client, farmers_url, agent, etag, "update_farmer")
+
+        moved = crud.update_farmer(db, new_farmer_id, schemas.FarmerUpdate(company_id=other_company_id))
+        _check(moved.company_id == other_company_id, "FarmerUpdate did not move the farmer")
+        etag = expect_changed(client, farmers_url, agent, etag, "update_farmer (old company)")
+        other_etag = expect_changed(client, farmers_url, other_agent, other_etag, "update_farmer (new company)")
+
+        crud.delete_farmer(db, new_farmer_id)
+        other_etag = expect_changed(client, farmers_url, other_agent, other_etag, "delete_farmer")
+        expect_unchanged(client, farmers_url, agent, etag)
+    finally:
+        db.close()
+
+    receipts_etag = client.get(receipts_url, headers=agent).headers["etag"]
+    expect_unchanged(client, receipts_url, agent, receipts_etag)
+    response = client.post(receipts_url, headers=agent, params={"receipt_date": "2024-02-01"})
+    _check(response.status_code == 201, f"generate receipt returned {response.status_code}")
+    expect_changed(client, receipts_url, agent, receipts_etag, "calculate_and_create_receipt")
+
+
+def wire_size(response) -> int:
+    """Approximate HTTP/1.1 bytes on the wire: status line, headers and body."""
+    status_line = f"HTTP/1.1 {response.status_code} {response.reason_phrase}\r\n"
+    header_bytes = sum(len(name) + len(value) + 4 for name, value in response.headers.raw)
+    return len(status_line) + header_bytes + 2 + response.num_bytes_downloaded
+
+
+def poll(client: TestClient, timer: ServerCPUTimer, url: str, headers: dict, polls: int, conditional: bool):
+    etag = None
+    total_bytes = 0
+    body_bytes = 0
+    statuses = set()
+    timer.seconds = 0.0
+    start = time.process_time()
+    for _ in range(polls):
+        request_headers = dict(headers)
+        if conditional and etag:
+            request_headers["If-None-Match"] = etag
+        response = client.get(url, headers=request_headers)
+        etag = response.headers.get("etag", etag)
+        total_bytes += wire_size(response)
+        body_bytes += response.num_bytes_downloaded
+        statuses.add(response.status_code)
+    total = time.process_time() - start
+    return total_bytes / polls, body_bytes / polls, timer.seconds * 1000 / polls, total * 1000 / polls, sorted(statuses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--polls", type=int, default=500)
+    parser.add_argument("--farmers", type=int, default=300)
+    parser.add_argument("--receipts", type=int, default=100)
+    args = parser.parse_args()
+
+    # Point the app at an in-memory database *before* importing main, whose
+    # import-time create_all() would otherwise touch settings.DATABASE_URL.
+    database.engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    database.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=database.engine)
+    from .main import app
+
+    company_id, other_company_id, farmer_id = seed(args.farmers, args.receipts)
+    timer = ServerCPUTimer(app)
+
+    with TestClient(timer) as client:
+        check_invalidation(client, company_id, other_company_id, farmer_id)
+        print("ETag invalidation check passed")
+
+        auth_header = login(client, "bench_agent")
+        scenarios = [
+            ("identity", {"Accept-Encoding": "identity"}, False),
+            ("gzip", {"Accept-Encoding": "gzip"}, False),
+            ("etag", {"Accept-Encoding": "gzip"}, True),
+        ]
+        endpoints = [
+            ("GET /farmers/", "/farmers/"),
+            ("GET /farmers/{id}/receipts/", f"/farmers/{farmer_id}/receipts/"),
+        ]
+
+        print(f"{args.polls} polls per row, {args.farmers} farmers, {args.receipts} receipts")
+        print(
+            f"{'endpoint':<30} {'scenario':<10} {'wire bytes':>11} {'body bytes':>11} "
+            f"{'server CPU ms':>14} {'total CPU ms':>13}  status"
+        )
+        for label, url in endpoints:
+            for name, headers, conditional in scenarios:
+                size, body_size, server_ms, total_ms, statuses = poll(
+                    client, timer, url, {**auth_header, **headers}, args.polls, conditional
+                )
+                print(
+                    f"{label:<30} {name:<10} {size:>11.0f} {body_size:>11.0f} "
+                    f"{server_ms:>14.3f} {total_ms:>13.3f}  {statuses}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import date
 from typing import List, Optional
@@ -88,6 +89,27 @@ def delete_user(db: Session, user_id: int):
         db.commit()
     return db_user
 
+# --- Version Counters ---
+# Cheap per-company / per-farmer counters used to build ETags for the list
+# endpoints. Every write below bumps the relevant counter in the same
+# transaction, so a client holding the current ETag can be answered with a
+# 304 without running the list query. Bumps coalesce NULL to 0 so rows from a
+# hand-added column without a default still advance.
+def get_farmers_version(db: Session, company_id: int):
+    return db.query(models.Company.farmers_version).filter(models.Company.id == company_id).scalar()
+
+def _bump_farmers_version(db: Session, company_id: int):
+    db.query(models.Company).filter(models.Company.id == company_id).update(
+        {models.Company.farmers_version: func.coalesce(models.Company.farmers_version, 0) + 1},
+        synchronize_session=False
+    )
+
+def _bump_receipts_version(db: Session, farmer_id: int):
+    db.query(models.Farmer).filter(models.Farmer.id == farmer_id).update(
+        {models.Farmer.receipts_version: func.coalesce(models.Farmer.receipts_version, 0) + 1},
+        synchronize_session=False
+    )
+
 # --- Farmer Operations ---
 def get_farmer(db: Session, farmer_id: int):
     return db.query(models.Farmer).filter(models.Farmer.id == farmer_id).first()
@@ -107,6 +129,7 @@ def get_farmer_by_mobile_number(db: Session, mobile_number: str, company_id: int
 def create_farmer(db: Session, farmer: schemas.FarmerCreate):
     db_farmer = models.Farmer(**farmer.model_dump())
     db.add(db_farmer)
+    _bump_farmers_version(db, db_farmer.company_id)
     db.commit()
     db.refresh(db_farmer)
     return db_farmer
@@ -114,10 +137,14 @@ def create_farmer(db: Session, farmer: schemas.FarmerCreate):
 def update_farmer(db: Session, farmer_id: int, farmer_update: schemas.FarmerUpdate):
     db_farmer = get_farmer(db, farmer_id)
     if db_farmer:
+        old_company_id = db_farmer.company_id
         update_data = farmer_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_farmer, key, value)
         db.add(db_farmer)
+        _bump_farmers_version(db, old_company_id)
+        if db_farmer.company_id != old_company_id:
+            _bump_farmers_version(db, db_farmer.company_id)
         db.commit()
         db.refresh(db_farmer)
     return db_farmer
@@ -126,6 +153,7 @@ def delete_farmer(db: Session, farmer_id: int):
     db_farmer = get_farmer(db, farmer_id)
     if db_farmer:
         db.delete(db_farmer)
+        _bump_farmers_version(db, db_farmer.company_id)
         db.commit()
     return db_farmer
 
@@ -201,6 +229,7 @@ def calculate_and_create_receipt(db: Session, farmer_id: int, receipt_date: date
         final_balance=final_balance
     )
     db.add(db_receipt)
+    _bump_receipts_version(db, farmer_id)
     db.commit()
     db.refresh(db_receipt)
     return db_receipt
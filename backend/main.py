@@ -1,16 +1,21 @@
 from datetime import timedelta, date
 from typing import List, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from . import crud, models, schemas, auth
 from .database import engine, get_db
 from .config import settings
+from .etags import make_etag, not_modified
 
 # Create all database tables.
 # This should ideally be handled by a migration tool like Alembic in production.
+# create_all() does not add new columns to existing tables: databases created
+# before the ETag version counters must run
+# `python -m backend.upgrade_version_counters` (see that module for the SQL).
 models.Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
@@ -19,6 +24,9 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Compress larger JSON bodies for clients on slow mobile links.
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 @app.post("/token", response_model=schemas.Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
@@ -122,6 +130,8 @@ async def create_farmer(
 
 @app.get("/farmers/", response_model=List[schemas.Farmer])
 async def read_farmers(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
@@ -129,10 +139,16 @@ async def read_farmers(
 ):
     """
     Retrieve a list of farmers for the user's company. Admins can see all.
+    Non-admin responses carry an ETag; a matching If-None-Match returns 304.
     """
     if current_user.role == "admin":
         farmers = crud.get_farmers(db, skip=skip, limit=limit)
     else:
+        version = crud.get_farmers_version(db, company_id=current_user.company_id)
+        etag = make_etag("farmers", current_user.company_id, version, skip, limit)
+        cached = not_modified(request, response, etag)
+        if cached is not None:
+            return cached
         farmers = crud.get_farmers_by_company(db, company_id=current_user.company_id, skip=skip, limit=limit)
     return farmers
 
@@ -209,6 +225,8 @@ async def generate_farmer_receipt(
 @app.get("/farmers/{farmer_id}/receipts/", response_model=List[schemas.Receipt])
 async def get_farmer_receipts(
     farmer_id: int,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
@@ -216,6 +234,7 @@ async def get_farmer_receipts(
 ):
     """
     Retrieve all receipts for a specific farmer.
+    Responses carry an ETag; a matching If-None-Match returns 304.
     """
     farmer = crud.get_farmer(db, farmer_id=farmer_id)
     if not farmer:
@@ -227,4 +246,9 @@ async def get_farmer_receipts(
             detail="You do not have permission to view receipts for this farmer."
         )
 
+    etag = make_etag("receipts", farmer_id, farmer.receipts_version, skip, limit)
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+
     return crud.get_receipts_by_farmer(db, farmer_id=farmer_id, skip=skip, limit=limit)
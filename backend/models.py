@@ -2,7 +2,7 @@ from __future__ import annotations
 from datetime import date
 from typing import List, Optional
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
@@ -15,6 +15,8 @@ class Company(Base):
     address: Mapped[Optional[str]]
     contact_person: Mapped[Optional[str]]
     phone_number: Mapped[Optional[str]]
+    # Bumped by crud on every farmer write; feeds the GET /farmers/ ETag.
+    farmers_version: Mapped[int] = mapped_column(default=0, server_default=text("0"))
 
     users: Mapped[List["User"]] = relationship(back_populates="company")
     farmers: Mapped[List["Farmer"]] = relationship(back_populates="company")
@@ -43,6 +45,8 @@ class Farmer(Base):
     aadhaar_number: Mapped[Optional[str]] = mapped_column(String, unique=True)
     farm_area_acres: Mapped[float]
     company_id: Mapped[int] = mapped_column(ForeignKey("companies.id"))
+    # Bumped by crud on every receipt write; feeds the receipts list ETag.
+    receipts_version: Mapped[int] = mapped_column(default=0, server_default=text("0"))
 
     company: Mapped["Company"] = relationship(back_populates="farmers")
     seed_distributions: Mapped[List["SeedDistribution"]] = relationship(back_populates="farmer")
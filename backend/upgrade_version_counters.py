@@ -0,0 +1,44 @@
+"""
+Adds the ETag version counter columns to a database created before they
+existed. create_all() only creates missing tables, not missing columns, so
+without this every Company / Farmer query fails with "no such column".
+
+Safe to run repeatedly; columns that already exist are skipped.
+
+Usage (from the repository root):
+
+    python -m backend.upgrade_version_counters
+
+Equivalent SQL, for running by hand:
+
+    ALTER TABLE companies ADD COLUMN farmers_version INTEGER NOT NULL DEFAULT 0;
+    ALTER TABLE farmers ADD COLUMN receipts_version INTEGER NOT NULL DEFAULT 0;
+"""
+from sqlalchemy import inspect, text
+
+from .database import engine
+
+VERSION_COLUMNS = [
+    ("companies", "farmers_version"),
+    ("farmers", "receipts_version"),
+]
+
+
+def upgrade():
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table, column in VERSION_COLUMNS:
+            if not inspector.has_table(table):
+                continue
+            existing = {col["name"] for col in inspector.get_columns(table)}
+            if column in existing:
+                print(f"{table}.{column} already present")
+                continue
+            connection.execute(text(
+                f"ALTER TABLE {table} ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+            ))
+            print(f"Added {table}.{column}")
+
+
+if __name__ == "__main__":
+    upgrade()